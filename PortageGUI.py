@@ -3,21 +3,42 @@ import os
 import subprocess
 import re
 import math
+import enum
+import functools
+import pickle
+import shutil
+import tempfile
+import select
+import time
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTabWidget, QListWidget, QPushButton, QLineEdit, QLabel,
+    QTabWidget, QListView, QPushButton, QLineEdit, QLabel,
     QStatusBar, QProgressBar, QMessageBox, QTextEdit, QSplitter,
     QListWidgetItem, QTreeWidget, QTreeWidgetItem, QHeaderView
 )
 from PyQt6.QtCore import (
-    Qt, QThread, pyqtSignal, QObject, QTimer, QRegularExpression
+    Qt, QThread, pyqtSignal, QObject, QTimer, QRegularExpression, QEvent,
+    QAbstractListModel, QModelIndex, QRunnable, QThreadPool, QMutex, QMutexLocker
 )
-from PyQt6.QtGui import QPalette, QColor, QIcon, QTextCursor
+from PyQt6.QtGui import QPalette, QColor, QIcon, QTextCursor, QTextCharFormat
 
 # --- Configuration ---
 COMMAND_TIMEOUT = 300  # Seconds for command timeout
-REFRESH_INTERVAL = 300000  # Milliseconds for disk space refresh (5 minutes)
+READ_CHUNK_SIZE = 65536  # Bytes read from a subprocess pipe per syscall
+PROGRESS_BATCH_LINES = 64  # Max output lines per progress signal
+PROGRESS_FLUSH_INTERVAL = 0.02  # Seconds before buffered output lines are flushed anyway
+LIST_LOAD_THREADS = 4  # Threads for data-fetching workers; must be >= the 3 concurrent list loads, which mostly wait on subprocesses
+REFRESH_INTERVAL = 300000  # Milliseconds between disk space checks (5 minutes); emerge actions also refresh it when they end
+_HALF_TENTH_GB = 1 << 29  # Added before the >> 30 in bytes * 10 -> tenths of a GiB, so it rounds
+DISK_INFO_TEMPLATE = "Disk (/): {:.1f}/{:.1f} GB ({:.1f} GB Free)"  # Disk space label text
+DISK_STATS_MAX_AGE = 1800.0  # Seconds before a check re-reads statvfs anyway, to catch changes made by other programs
+CONSOLE_MAX_BLOCKS = 5000  # Lines kept in the output console; older lines are dropped
+CONSOLE_FLUSH_MS = 50  # Milliseconds over which worker output is coalesced into one console insert
+FILTER_DEBOUNCE_MS = 150  # Milliseconds of typing pause before a package list is filtered
 APP_ICON_PATH = "/usr/share/icons/hicolor/48x48/apps/system-software-install.png" # Example path
+# External tools resolved once at startup; a value is None if the tool is not in PATH
+TOOLS = {name: shutil.which(name) for name in ('emerge', 'equery', 'eix', 'pkexec')}
+EIX_DB_PATH = os.environ.get('EIX_CACHEFILE', '/var/cache/eix/portage.eix') # eix database, keys the available-packages cache
 
 # --- ANSI Color Conversion ---
 try:
@@ -28,13 +49,170 @@ except ImportError:
     ANSI_ENABLED = False
     print("Warning: 'ansi2html' library not found. Output console will not display colors.")
     print("Install it using: pip install ansi2html")
-    # Basic ANSI escape sequence removal as fallback
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Basic ANSI escape sequence removal, used when ansi2html is missing; compiled once at import
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+_HAS_ESC = ('\x1b', '\x9b') # ESC and the single-byte CSI introducer
+
+def has_ansi_escape(text):
+    """Returns True if text contains an ANSI escape/CSI introducer."""
+    return any(c in text for c in _HAS_ESC)
+
+@functools.lru_cache(maxsize=4096)
+def _ansi_to_html(text):
+    """Converts one ANSI-colored line to HTML; emerge repeats many colored lines, so results are cached."""
+    return conv.convert(text, full=False)
+
+def strip_or_convert_ansi(text):
+    """Prepares a line or a newline-joined block of lines for the output console.
+
+    Returns a (text, is_html) tuple. Text without escape sequences (the vast
+    majority of emerge output) is returned untouched, skipping the ansi2html
+    converter / fallback regex entirely. A block is converted in a single
+    conv.convert(full=False) call, so the cost is paid per batch, not per line;
+    only single lines go through the cache (blocks rarely repeat).
+    """
+    if not has_ansi_escape(text):
+        return text, False
+    if ANSI_ENABLED:
+        return (_ansi_to_html(text) if '\n' not in text else conv.convert(text, full=False)), True
+    return _ANSI_RE.sub('', text), False
+
+# --- Optional NumPy Filtering ---
+@functools.lru_cache(maxsize=None)
+def load_numpy():
+    """Imports NumPy on first use, or returns None if it isn't installed.
+
+    Used for the vectorized substring search over the available-packages list.
+    The import alone takes ~100 ms, so it is done while the list is indexed
+    instead of on every launch.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None # Pure-Python filtering is used instead
+    return numpy
+
+def iter_pipe_lines(stream, idle_timeout=None, wake_fd=None):
+    """Yields decoded lines from a binary pipe.
+
+    Reads in large chunks and splits on newlines itself, so a command printing
+    thousands of lines costs one read per chunk instead of one per line.
+    If idle_timeout is given, it is called before each read and returns the
+    seconds to wait for more data (or None to block); when that wait runs out,
+    None is yielded so callers can flush buffered output. None is also yielded
+    once wake_fd becomes readable, so a blocked reader can notice a cancel.
+    """
+    fd = stream.fileno()
+    watched = [fd] if wake_fd is None else [fd, wake_fd]
+    buf = bytearray()
+    while True:
+        timeout = idle_timeout() if idle_timeout is not None else None
+        if timeout is not None or wake_fd is not None:
+            ready = select.select(watched, [], [], timeout)[0]
+            if not ready or wake_fd in ready:
+                yield None
+                continue
+        chunk = os.read(fd, READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buf += chunk
+        start = 0
+        while True:
+            idx = buf.find(b'\n', start)
+            if idx < 0: break
+            yield buf[start:idx].decode('utf-8', 'replace')
+            start = idx + 1
+        del buf[:start] # Keep only the incomplete tail
+    if buf: # Flush a final line without trailing newline
+        yield buf.decode('utf-8', 'replace')
+
+def format_command_failure(command_list, returncode, stderr_output):
+    """Builds the error message for a failed command.
+
+    Only called on the failure path, so the argv join and stderr strip are
+    never paid for commands that succeed.
+    """
+    error_message = f"Command failed with exit code {returncode}.\n"
+    error_message += f"Command: {' '.join(command_list)}\n"
+    if stderr_output: error_message += f"Stderr:\n{stderr_output.strip()}"
+    else: error_message += "No stderr output captured." # More informative
+    return error_message
+
+def tool_path(name):
+    """Returns the absolute path of an external tool, or its bare name if it wasn't found."""
+    return TOOLS.get(name) or name # Bare name lets Popen raise FileNotFoundError as usual
+
+# --- Parsing Patterns ---
+# Compiled once at import instead of on every refresh / selection
+# Captures category/package, ignoring version or flags
+# Handles formats like: cat/pkg, cat/pkg-1.2.3, cat/pkg -> 1.2.4 [Update]
+_ATOM_RE = re.compile(r'^([\w.+-]+/[\w.+-]+)')
+# 'emerge -upNDq' merge lines start with one of these; the bracketed flags header is split
+# off with str.partition and only the remainder goes through a (small) regex
+_UPDATE_PREFIXES = ('[ebuild', '[binary') # Same length, so the flags always start at index 7
+_UPDATE_REST_RE = re.compile(
+    r"\s*([\w.+-]+/[\w.+-]+)"      # Package Atom (cat/pkg) - more robust chars allowed
+    r"-([\d.]\S*(?:\s+\[[^\]]*\])?)" # Version (starts with digit), plus the installed [old] version if shown
+    r"(?:.*?->\s*([\w.+-/]+-[\d.]+\S*))?" # Optional new version/slot (-> target)
+)
+
+# --- Available Packages Cache ---
+def _available_cache_path():
+    """Returns the path of the on-disk cache of parsed available package atoms."""
+    cache_home = os.path.expanduser(os.environ.get('XDG_CACHE_HOME', '~/.cache'))
+    return os.path.join(cache_home, 'portagegui', 'available.pkl')
+
+def _available_cache_key():
+    """Returns a key that changes whenever eix's database is rebuilt, or None if it can't be read.
+
+    'eix */*' only reports what is in its database, so the parsed list stays
+    valid until eix-update / eix-sync rewrites that file.
+    """
+    try:
+        st = os.stat(EIX_DB_PATH)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def load_available_cache(key):
+    """Returns the cached atom list if it was saved under the same key, else None."""
+    if key is None:
+        return None
+    try:
+        with open(_available_cache_path(), 'rb') as f:
+            cached_key, packages = pickle.load(f)
+    except Exception: # Missing, unreadable or corrupt cache: just reload from eix
+        return None
+    if cached_key != key:
+        return None
+    return [sys.intern(p) for p in packages] # Unpickled strings are fresh copies, intern them like the parser does
+
+def save_available_cache(key, packages):
+    """Stores the atom list for the next start; failures are only logged."""
+    if key is None:
+        return
+    path = _available_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((key, packages), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path) # Atomic, never leaves a half-written cache
+    except OSError as e:
+        print(f"Warning: Could not write available packages cache: {e}")
+
+# --- Worker State ---
+class WorkerState(enum.Enum):
+    IDLE = 0        # Not started yet counts as RUNNING; IDLE once run() has returned
+    RUNNING = 1
+    CANCELLING = 2  # stop() was called, run() is winding down
 
 # --- Worker Signals ---
 class WorkerSignals(QObject):
     finished = pyqtSignal(object)  # Pass callback arg through
-    error = pyqtSignal(str, object)  # Pass callback arg through
+    error = pyqtSignal(str, object, object)  # Pass callback arg through, plus the exit code (None if the command didn't complete)
     result = pyqtSignal(object)
     progress = pyqtSignal(str)
     progress_val = pyqtSignal(int, int) # For determinate progress (not used here yet)
@@ -48,180 +226,424 @@ class CommandWorker(QThread):
         self.signals = WorkerSignals()
         self.use_pkexec = use_pkexec
         self.process = None
-        self._running = True
+        self.state = WorkerState.RUNNING
+        self._lock = QMutex() # Guards state/process between run() and stop() on the GUI thread
         self.callback_arg = callback_arg  # Store callback arg
+        self._pending = [] # Output lines not yet sent through signals.progress
+        self._last_flush = time.monotonic()
+        self._wake_w = None # Write end of the pipe stop() uses to wake the blocked stdout reader
+
+    def _flush_progress(self):
+        """Emits all buffered output lines as a single progress block."""
+        if self._pending:
+            self.signals.progress.emit('\n'.join(self._pending))
+            self._pending.clear()
+        self._last_flush = time.monotonic()
 
     def run(self):
+        stderr_file = None
         try:
             full_command = self.command_list
             if self.use_pkexec:
-                # Check if pkexec exists first
-                if subprocess.run(['which', 'pkexec'], capture_output=True, text=True).returncode != 0:
-                    self.signals.error.emit("Error: 'pkexec' command not found. Is PolicyKit installed?", self.callback_arg)
-                    return
-                full_command = ['pkexec', '--disable-internal-agent'] + self.command_list
-
-            self.process = subprocess.Popen(
-                full_command,
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                text=True, bufsize=1, errors='replace' # line buffered, replace encoding errors
-            )
+                # run_emerge_command has already checked that pkexec exists
+                full_command = [TOOLS['pkexec'], '--disable-internal-agent'] + self.command_list
 
-            # Read stdout line by line
+            with QMutexLocker(self._lock):
+                if self.state is not WorkerState.RUNNING:
+                    # Cancelled before the process existed, so stop() had nothing to terminate
+                    self.signals.error.emit("Operation Cancelled", self.callback_arg, None)
+                    return
+                # stderr goes to a temp file: portage's einfo/ewarn output can fill a pipe that is
+                # only read after stdout ends, which would stall a long build
+                stderr_file = tempfile.TemporaryFile()
+                self.process = subprocess.Popen(
+                    full_command,
+                    stdout=subprocess.PIPE, stderr=stderr_file,
+                    bufsize=READ_CHUNK_SIZE # Binary pipe, decoded per line by iter_pipe_lines
+                )
+                wake_r, self._wake_w = os.pipe()
+
+            # Read stdout in chunks, emitting complete lines in batches
             if self.process.stdout:
-                for line in iter(self.process.stdout.readline, ''):
-                    if not self._running: break
-                    self.signals.progress.emit(line.strip()) # Emit stripped line
+                # Only wake up on a quiet pipe while there are buffered lines to flush (or on cancel,
+                # since children of a terminated emerge/pkexec may keep the pipe open)
+                idle_timeout = lambda: PROGRESS_FLUSH_INTERVAL if self._pending else None
+                for line in iter_pipe_lines(self.process.stdout, idle_timeout=idle_timeout, wake_fd=wake_r):
+                    if self.state is not WorkerState.RUNNING: break
+                    if line is not None:
+                        self._pending.append(line.rstrip('\r\n')) # Keep emerge's leading indentation
+                    # Flush when the batch is full, the interval passed, or the pipe went quiet
+                    if (line is None or len(self._pending) >= PROGRESS_BATCH_LINES
+                            or time.monotonic() - self._last_flush >= PROGRESS_FLUSH_INTERVAL):
+                        self._flush_progress()
+                self._flush_progress() # Emit whatever is left
                 self.process.stdout.close()
 
-            if not self._running:
+            if self.state is not WorkerState.RUNNING:
                  # If stopped during stdout reading
-                self.signals.error.emit("Operation Cancelled", self.callback_arg)
+                self.signals.error.emit("Operation Cancelled", self.callback_arg, None)
                 return
 
-            # Read stderr after stdout is closed
-            stderr_output = ""
-            if self.process.stderr:
-                stderr_output = self.process.stderr.read()
-                self.process.stderr.close()
-
-            # Wait for process termination
+            # Wait for process termination, then read back its stderr
             self.process.wait(timeout=COMMAND_TIMEOUT)
+            stderr_file.seek(0)
+            stderr_output = stderr_file.read().decode('utf-8', 'replace')
 
             # Check return code AFTER process finishes
             if self.process.returncode != 0:
-                error_message = f"Command failed with exit code {self.process.returncode}.\n"
-                error_message += f"Command: {' '.join(full_command)}\n"
-                if stderr_output: error_message += f"Stderr:\n{stderr_output.strip()}"
-                else: error_message += "No stderr output captured." # More informative
-                self.signals.error.emit(error_message, self.callback_arg)
+                error_message = format_command_failure(full_command, self.process.returncode, stderr_output)
+                self.signals.error.emit(error_message, self.callback_arg, self.process.returncode)
             else:
                 self.signals.result.emit("Command finished successfully.") # Emit generic success
                 # Pass callback arg with finished signal
                 self.signals.finished.emit(self.callback_arg)
 
         except FileNotFoundError:
-            self.signals.error.emit(f"Error: Command '{self.command_list[0]}' not found.", self.callback_arg)
+            self.signals.error.emit(f"Error: Command '{self.command_list[0]}' not found.", self.callback_arg, None)
         except subprocess.TimeoutExpired:
             if self.process: self.process.kill()
-            self.signals.error.emit(f"Command timed out after {COMMAND_TIMEOUT} seconds.", self.callback_arg)
+            self.signals.error.emit(f"Command timed out after {COMMAND_TIMEOUT} seconds.", self.callback_arg, None)
         except Exception as e:
-            self.signals.error.emit(f"An unexpected error occurred in CommandWorker: {e}", self.callback_arg)
+            self.signals.error.emit(f"An unexpected error occurred in CommandWorker: {e}", self.callback_arg, None)
         finally:
-             self._running = False # Ensure running flag is cleared
+            if stderr_file is not None:
+                stderr_file.close()
+            with QMutexLocker(self._lock):
+                self.state = WorkerState.IDLE # Ensure running state is cleared
+                if self._wake_w is not None:
+                    os.close(wake_r)
+                    os.close(self._wake_w)
+                    self._wake_w = None
 
     def stop(self):
-        self._running = False
-        if self.process and self.process.poll() is None: # Check if process is still running
+        with QMutexLocker(self._lock):
+            if self.state is not WorkerState.RUNNING:
+                return # Already cancelling or finished
+            self.state = WorkerState.CANCELLING
+            process = self.process # None if run() hasn't spawned it yet; run() then bails out itself
+            if self._wake_w is not None:
+                os.write(self._wake_w, b'x') # Unblocks the stdout reader in run()
+        if process and process.poll() is None: # Check if process is still running
             try:
                 self.signals.progress.emit("Attempting to terminate process...")
                 # Try terminate first (graceful)
-                self.process.terminate()
-                try: self.process.wait(timeout=2) # Wait briefly for terminate
+                process.terminate()
+                try: process.wait(timeout=2) # Wait briefly for terminate
                 except subprocess.TimeoutExpired:
                     # Force kill if terminate didn't work
                     self.signals.progress.emit("Forcing process kill...")
-                    self.process.kill()
+                    process.kill()
                 self.signals.progress.emit("Termination signal sent.")
             except Exception as e:
                  self.signals.progress.emit(f"Could not stop process cleanly: {e}")
 
 
 # --- Generic Worker for Data Fetching (No pkexec needed) ---
-class GenericWorker(QThread):
+_list_load_pool = None
+
+def list_load_pool():
+    """Returns the thread pool data-fetching workers run on, creating it on first use.
+
+    Not QThreadPool.globalInstance(): that is capped at one thread per CPU core,
+    so on small machines a slow eix would queue the other loads (and their
+    cancellation) behind it even though they only wait on subprocesses.
+    """
+    global _list_load_pool
+    if _list_load_pool is None:
+        _list_load_pool = QThreadPool()
+        _list_load_pool.setMaxThreadCount(LIST_LOAD_THREADS)
+    return _list_load_pool
+
+class GenericWorker(QRunnable):
+    """Runs a short data-fetching command on the list-load QThreadPool.
+
+    Unlike CommandWorker this is not a QThread: list loads reuse the pool's
+    threads instead of spawning a new OS thread per command.
+    """
     def __init__(self, command_list, parser_func=None, callback_arg=None): # Add callback_arg
         super().__init__()
         self.command_list = command_list
         self.parser_func = parser_func
         self.signals = WorkerSignals()
         self.process = None
-        self._running = True
+        self.state = WorkerState.RUNNING
+        self._lock = QMutex() # Guards state/process between run() and stop() on the GUI thread
         self.callback_arg = callback_arg # Store callback arg
 
+    def start(self):
+        """Queues the worker on the list-load thread pool (the pool deletes it after run())."""
+        list_load_pool().start(self)
+
     def run(self):
         try:
-            self.process = subprocess.Popen(
-                self.command_list,
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                text=True, bufsize=1, errors='replace'
-            )
-
-            stdout_lines = []
-            if self.process.stdout:
-                 for line in iter(self.process.stdout.readline, ''):
-                    if not self._running: break
-                    stdout_lines.append(line.strip()) # Collect lines
-                 self.process.stdout.close()
-
-            if not self._running:
-                self.signals.error.emit("Operation Cancelled", self.callback_arg)
-                return
+            # Stream stdout into a line list (no full copy of the raw output is held), while
+            # stderr goes to a temp file so it can never fill its pipe and stall the command
+            with tempfile.TemporaryFile() as stderr_file:
+                with QMutexLocker(self._lock):
+                    if self.state is not WorkerState.RUNNING:
+                        # Cancelled before the process existed, so stop() had nothing to terminate
+                        self.signals.error.emit("Operation Cancelled", self.callback_arg, None)
+                        return
+                    self.process = subprocess.Popen(
+                        self.command_list,
+                        stdout=subprocess.PIPE, stderr=stderr_file,
+                        bufsize=READ_CHUNK_SIZE # Binary pipe, decoded per line by iter_pipe_lines
+                    )
+                stdout_lines = []
+                for line in iter_pipe_lines(self.process.stdout):
+                    if self.state is not WorkerState.RUNNING: break # Cancelled mid-stream
+                    stdout_lines.append(line.rstrip('\r'))
+                self.process.stdout.close()
 
-            stderr_output = ""
-            if self.process.stderr:
-                stderr_output = self.process.stderr.read()
-                self.process.stderr.close()
+                if self.state is not WorkerState.RUNNING:
+                    self.signals.error.emit("Operation Cancelled", self.callback_arg, None)
+                    return
 
-            self.process.wait(timeout=COMMAND_TIMEOUT)
+                self.process.wait(timeout=COMMAND_TIMEOUT)
+                stderr_file.seek(0)
+                stderr_output = stderr_file.read().decode('utf-8', 'replace')
 
             if self.process.returncode != 0:
-                error_message = f"Command failed with exit code {self.process.returncode}.\n"
-                error_message += f"Command: {' '.join(self.command_list)}\n"
-                if stderr_output: error_message += f"Stderr:\n{stderr_output.strip()}"
-                else: error_message += "No stderr output captured."
+                error_message = format_command_failure(self.command_list, self.process.returncode, stderr_output)
                 # Pass callback arg with error signal
-                self.signals.error.emit(error_message, self.callback_arg)
+                self.signals.error.emit(error_message, self.callback_arg, self.process.returncode)
             else:
                 # Process results *if* the command succeeded
-                result_data = stdout_lines # Default to raw lines if no parser
                 if self.parser_func:
+                    parse_error = None
                     try:
-                        parsed_result = self.parser_func(stdout_lines)
-                        result_data = parsed_result
+                        result_data = self.parser_func(stdout_lines)
                     except Exception as e:
                          # Error during parsing is also an error condition for the task
-                        self.signals.error.emit(f"Error parsing command output: {e}\nOutput:\n{' '.join(stdout_lines[:10])}...", self.callback_arg)
+                        snippet = repr(' '.join(stdout_lines[:10]))[:500] # Bounded, whatever the lines hold
+                        parse_error = f"Error parsing command output: {e}\nOutput:\n{snippet}..."
+                    if parse_error is not None:
+                        # Outside the except block the traceback (and the parser frame holding
+                        # the lines) is gone, so this drops the last reference to the full output
+                        del stdout_lines
+                        self.signals.error.emit(parse_error, self.callback_arg, None)
                         return # Don't proceed to finished if parsing failed
+                else:
+                    result_data = stdout_lines # Raw lines if no parser
                 self.signals.result.emit(result_data)
                 # Pass callback arg with finished signal
                 self.signals.finished.emit(self.callback_arg)
 
         except FileNotFoundError:
             # Handle if the command (e.g., eix or equery) isn't installed
-            self.signals.error.emit(f"Error: Command '{self.command_list[0]}' not found. Is it installed and in PATH?", self.callback_arg)
+            self.signals.error.emit(f"Error: Command '{self.command_list[0]}' not found. Is it installed and in PATH?", self.callback_arg, None)
         except subprocess.TimeoutExpired:
             if self.process: self.process.kill()
-            self.signals.error.emit(f"Command timed out after {COMMAND_TIMEOUT} seconds.", self.callback_arg)
+            self.signals.error.emit(f"Command timed out after {COMMAND_TIMEOUT} seconds.", self.callback_arg, None)
         except Exception as e:
-            self.signals.error.emit(f"An unexpected error occurred in GenericWorker: {e}", self.callback_arg)
+            self.signals.error.emit(f"An unexpected error occurred in GenericWorker: {e}", self.callback_arg, None)
         finally:
-            self._running = False
+            with QMutexLocker(self._lock):
+                self.state = WorkerState.IDLE
 
     def stop(self):
-        self._running = False
-        if self.process and self.process.poll() is None:
+        with QMutexLocker(self._lock):
+            if self.state is not WorkerState.RUNNING:
+                return # Already cancelling or finished
+            self.state = WorkerState.CANCELLING
+            process = self.process # None if run() hasn't spawned it yet; run() then bails out itself
+        if process and process.poll() is None:
             try:
                 # GenericWorker might not output to console, so maybe don't emit progress here?
                 # Or maybe it's okay for debugging. Let's leave it for now.
                 self.signals.progress.emit("Attempting to terminate process...")
-                self.process.terminate()
-                try: self.process.wait(timeout=2)
+                process.terminate()
+                try: process.wait(timeout=2)
                 except subprocess.TimeoutExpired:
                     self.signals.progress.emit("Forcing process kill...")
-                    self.process.kill()
+                    process.kill()
                 self.signals.progress.emit("Termination signal sent.")
             except Exception as e:
                 self.signals.progress.emit(f"Could not stop process cleanly: {e}")
 
 
+# --- Function Worker for In-Process Loading ---
+class FunctionWorker(QRunnable):
+    """Runs a Python function (e.g. reading the package cache) on the list-load pool.
+
+    Reports through the same signals as GenericWorker, so it is tracked and
+    cancelled like a command that loads a list.
+    """
+    def __init__(self, func, callback_arg=None):
+        super().__init__()
+        self.func = func
+        self.command_list = None # Not a command; keeps run_generic_task's duplicate check working
+        self.signals = WorkerSignals()
+        self.state = WorkerState.RUNNING
+        self._lock = QMutex() # Guards state between run() and stop() on the GUI thread
+        self.callback_arg = callback_arg
+
+    def start(self):
+        """Queues the worker on the list-load thread pool (the pool deletes it after run())."""
+        list_load_pool().start(self)
+
+    def run(self):
+        try:
+            if self.state is WorkerState.RUNNING: # Not cancelled while queued
+                result_data = self.func()
+            if self.state is not WorkerState.RUNNING:
+                self.signals.error.emit("Operation Cancelled", self.callback_arg, None)
+                return
+            self.signals.result.emit(result_data)
+            self.signals.finished.emit(self.callback_arg)
+        except Exception as e:
+            self.signals.error.emit(f"An unexpected error occurred in FunctionWorker: {e}", self.callback_arg, None)
+        finally:
+            with QMutexLocker(self._lock):
+                self.state = WorkerState.IDLE
+
+    def stop(self):
+        with QMutexLocker(self._lock):
+            if self.state is WorkerState.RUNNING:
+                self.state = WorkerState.CANCELLING # There is no process; run() drops the result
+
+
+# --- List Model for Large Package Lists ---
+class PkgListModel(QAbstractListModel):
+    """Read-only model showing a plain Python list of strings.
+
+    The list is referenced, not copied, and no per-row item objects are
+    created; the view only asks for the rows it actually paints.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self._items[index.row()]
+        return None
+
+    def set_items(self, items):
+        """Replaces all rows with the given list (one model reset)."""
+        self.beginResetModel()
+        self._items = items
+        self.endResetModel()
+
+
+# --- Dark Theme ---
+_DARK_PALETTE = None # Built on first use, needs a QApplication
+
+def _dark_palette():
+    """Returns the application's dark QPalette, building it only once."""
+    global _DARK_PALETTE
+    if _DARK_PALETTE is None:
+        dark_palette = QPalette()
+        # Base Colors
+        dark_palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53)) # Main window background
+        dark_palette.setColor(QPalette.ColorRole.WindowText, Qt.GlobalColor.white) # Text on window
+        dark_palette.setColor(QPalette.ColorRole.Base, QColor(42, 42, 42)) # Input fields, list backgrounds
+        dark_palette.setColor(QPalette.ColorRole.AlternateBase, QColor(66, 66, 66)) # Alternate row color (if used)
+        dark_palette.setColor(QPalette.ColorRole.ToolTipBase, Qt.GlobalColor.black)
+        dark_palette.setColor(QPalette.ColorRole.ToolTipText, Qt.GlobalColor.white)
+        dark_palette.setColor(QPalette.ColorRole.Text, Qt.GlobalColor.white) # General text in widgets
+        dark_palette.setColor(QPalette.ColorRole.Button, QColor(53, 53, 53)) # Button background
+        dark_palette.setColor(QPalette.ColorRole.ButtonText, Qt.GlobalColor.white) # Button text
+        dark_palette.setColor(QPalette.ColorRole.BrightText, Qt.GlobalColor.red) # e.g., text in critical message boxes
+
+        # Highlight Colors
+        dark_palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218)) # Blue highlight for selected items
+        dark_palette.setColor(QPalette.ColorRole.HighlightedText, Qt.GlobalColor.white) # Text in highlighted items
+
+        # Disabled Colors
+        dark_palette.setColor(QPalette.ColorRole.PlaceholderText, QColor(127, 127, 127)) # Placeholder text in line edits
+        dark_palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text, QColor(127, 127, 127))
+        dark_palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, QColor(127, 127, 127))
+        dark_palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.WindowText, QColor(127, 127, 127))
+        dark_palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Highlight, QColor(80, 80, 80)) # Disabled selection color
+        dark_palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.HighlightedText, QColor(127, 127, 127))
+        _DARK_PALETTE = dark_palette
+    return _DARK_PALETTE
+
+_DARK_STYLESHEET = """
+    QToolTip {
+        color: #ffffff; /* White text */
+        background-color: #2a82da; /* Blue background */
+        border: 1px solid white; /* White border */
+        padding: 2px;
+    }
+    QStatusBar {
+        color: #ffffff; /* White text in status bar */
+    }
+    QProgressBar {
+        border: 1px solid #666666; /* Gray border */
+        border-radius: 5px;
+        text-align: center; /* Center text if shown */
+        color: #ffffff; /* White text */
+        background-color: #424242; /* Dark gray background */
+    }
+    QProgressBar::chunk {
+        background-color: #4287f5; /* Blue progress chunk */
+        border-radius: 4px; /* Slightly rounded chunk */
+        margin: 1px; /* Small margin around chunk */
+    }
+    QListView, QTreeWidget { /* Apply to list views/widgets and tree widgets */
+        background-color: QColor(42, 42, 42); /* Match Base color */
+        /* Consider adding alternate row colors if desired */
+        /* alternate-background-color: QColor(66, 66, 66); */
+    }
+     QTreeView::item:hover, QListView::item:hover {
+         background-color: QColor(60, 60, 60); /* Slightly lighter on hover */
+     }
+    QTreeView::item:selected, QListView::item:selected {
+         background-color: #2a82da; /* Match Highlight color */
+         color: white; /* Ensure text is white when selected */
+     }
+    QTabWidget::pane { /* The area where tab content is shown */
+        border: none; /* No border around the content pane */
+     }
+    QTabWidget::tab-bar {
+        alignment: left; /* Align tabs to the left */
+    }
+    QTabBar::tab {
+        background: QColor(66, 66, 66); /* Darker gray for inactive tabs */
+        border: 1px solid #444; /* Slightly darker border */
+        border-bottom: none; /* No border at bottom for inactive */
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+        min-width: 10ex; /* Minimum width */
+        padding: 5px; /* Padding around text */
+        margin-right: 1px; /* Small space between tabs */
+        color: #dddddd; /* Lighter gray text for inactive/hover */
+    }
+    QTabBar::tab:hover {
+        background: QColor(80, 80, 80); /* Slightly lighter on hover */
+    }
+    QTabBar::tab:selected {
+        background: QColor(53, 53, 53); /* Match window background for selected */
+        border-color: #444;
+        border-bottom: none; /* Selected tab 'connects' to pane */
+        color: #ffffff; /* White text for selected */
+    }
+    QTabBar::tab:!selected {
+         margin-top: 2px; /* Make inactive tabs slightly lower */
+         background: QColor(70, 70, 70); /* Slightly different shade */
+         color: #aaaaaa; /* More subdued text */
+     }
+    QLineEdit {
+        background-color: QColor(42, 42, 42); /* Match Base */
+        padding: 2px;
+        border: 1px solid #666666; /* Gray border */
+        border-radius: 3px;
+    }
+     QTextEdit { /* Style for the output console */
+         background-color: QColor(30, 30, 30); /* Very dark background */
+         color: #f0f0f0; /* Off-white text */
+         border: 1px solid #444; /* Dark border */
+     }
+"""
+
+
 # --- Main Application Window ---
 class GentooPackageManagerGUI(QMainWindow):
-    # Define constants for load steps
-    LOAD_STEP_INSTALLED = 0
-    LOAD_STEP_AVAILABLE = 1 # Changed order slightly if needed, but keep names
-    LOAD_STEP_UPDATES = 2
-    LOAD_STEP_COMPLETE = 3
-
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Gentoo GUI Package Manager")
@@ -231,11 +653,24 @@ class GentooPackageManagerGUI(QMainWindow):
             self.setWindowIcon(QIcon(APP_ICON_PATH))
 
         self.installed_packages = []
+        self.installed_packages_lc = [] # Lower-cased copy for filtering, same order
         self.all_available_package_atoms = [] # Renamed for clarity
+        self.all_available_package_atoms_lc = [] # Lower-cased copy for filtering, same order
+        self.all_available_package_atoms_np = None # NumPy array of the lower-cased atoms (if NumPy is available)
+        self._installed_loaded = False # Set once a load succeeds; filters are no-ops until then
+        self._browse_loaded = False
         self.update_list_atoms = []
         self.update_list_display = []
-        self.current_worker = None # Tracks the currently active worker (only one allowed at a time now)
-
+        self._active_workers = set() # Workers that have not yet emitted finished/error
+        self._loading_lists = False # True while the package list loads are in flight
+        self._close_when_idle = False # Set when the user chose to exit during an operation
+        self._close_now = False # Lets closeEvent accept without asking again
+        self._refresh_pending = False # A refresh_all() is scheduled but hasn't run yet
+
+        self._tab_counts = {} # Tab index -> count currently shown in its text
+        self._statvfs_at = 0.0 # time.monotonic() of the last successful os.statvfs('/')
+        self._disk_info_key = () # Rounded values behind the disk space label text (None: error shown)
+        self._disk_dirty = True # Disk usage may have changed since the last statvfs (set until the first read)
         self.tab_base_texts = {
             "browse": "Browse Packages", "installed": "Installed Packages",
             "updates": "Updates", "output": "Output Console"
@@ -244,9 +679,9 @@ class GentooPackageManagerGUI(QMainWindow):
         self.setup_ui()
         self.apply_dark_mode()
 
-        # --- Initial Load (Start the sequential loading process) ---
-        self.refresh_disk_space() # Synchronous, do it first
-        self._start_next_load_step(self.LOAD_STEP_INSTALLED) # Start first step
+        # --- Initial Load (All lists load concurrently) ---
+        # Disk space is first shown by showEvent, once the window is actually visible
+        self._start_list_loads()
 
         self.disk_space_timer = QTimer(self)
         self.disk_space_timer.timeout.connect(self.refresh_disk_space)
@@ -283,8 +718,8 @@ class GentooPackageManagerGUI(QMainWindow):
         # --- Bottom Button Bar ---
         self.bottom_bar_layout = QHBoxLayout()
         self.refresh_button = QPushButton(QIcon.fromTheme("view-refresh"), " Refresh Lists") # Add icon
-        self.refresh_button.setToolTip("Reload installed, available, and update package lists sequentially")
-        self.refresh_button.clicked.connect(self.refresh_all) # Connect to start sequence
+        self.refresh_button.setToolTip("Reload installed, available, and update package lists in parallel")
+        self.refresh_button.clicked.connect(self.refresh_all) # Connect to start all list loads
         self.bottom_bar_layout.addWidget(self.refresh_button)
 
         self.sync_button = QPushButton(QIcon.fromTheme("network-transmit-receive"), " Sync Repositories") # Add icon
@@ -318,16 +753,24 @@ class GentooPackageManagerGUI(QMainWindow):
         layout.setSpacing(5)
         self.browse_search_input = QLineEdit()
         self.browse_search_input.setPlaceholderText("Filter available packages (e.g., category/name or just name)...")
-        self.browse_search_input.textChanged.connect(self.filter_browse_packages)
+        # Debounce: restart the timer on every keystroke, filter once typing pauses
+        self._browse_filter_timer = QTimer(self)
+        self._browse_filter_timer.setSingleShot(True)
+        self._browse_filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self._browse_filter_timer.timeout.connect(self.filter_browse_packages)
+        self.browse_search_input.textChanged.connect(lambda _text: self._browse_filter_timer.start())
         layout.addWidget(self.browse_search_input)
-        self.browse_package_list = QListWidget()
-        self.browse_package_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        self.browse_model = PkgListModel(self)
+        self.browse_package_list = QListView()
+        self.browse_package_list.setModel(self.browse_model)
+        self.browse_package_list.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.browse_package_list.setUniformItemSizes(True) # Rows are single lines, skip per-row size hints
         layout.addWidget(self.browse_package_list)
         self.browse_install_button = QPushButton(QIcon.fromTheme("list-add"), " Install Selected") # Add icon
         self.browse_install_button.clicked.connect(self.install_selected_browse)
         layout.addWidget(self.browse_install_button)
         # Initial state message
-        self.browse_package_list.addItem("Loading...")
+        self.browse_model.set_items(["Loading..."])
         self.update_tab_text(self.browse_tab_index, "browse", None) # Show (?) initially
 
     def _setup_installed_tab(self):
@@ -336,24 +779,34 @@ class GentooPackageManagerGUI(QMainWindow):
         layout.setSpacing(5)
         self.installed_search_input = QLineEdit()
         self.installed_search_input.setPlaceholderText("Filter installed packages...")
-        self.installed_search_input.textChanged.connect(self.filter_installed_packages)
+        self._installed_filter_timer = QTimer(self)
+        self._installed_filter_timer.setSingleShot(True)
+        self._installed_filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self._installed_filter_timer.timeout.connect(self.filter_installed_packages)
+        self.installed_search_input.textChanged.connect(lambda _text: self._installed_filter_timer.start())
         layout.addWidget(self.installed_search_input)
-        self.installed_package_list = QListWidget()
-        self.installed_package_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        self.installed_model = PkgListModel(self)
+        self.installed_package_list = QListView()
+        self.installed_package_list.setModel(self.installed_model)
+        self.installed_package_list.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.installed_package_list.setUniformItemSizes(True)
         layout.addWidget(self.installed_package_list)
         self.uninstall_button = QPushButton(QIcon.fromTheme("list-remove"), " Uninstall Selected") # Add icon
         self.uninstall_button.clicked.connect(self.uninstall_selected)
         layout.addWidget(self.uninstall_button)
         # Initial state message
-        self.installed_package_list.addItem("Loading...")
+        self.installed_model.set_items(["Loading..."])
         self.update_tab_text(self.installed_tab_index, "installed", None) # Show (?) initially
 
     def _setup_update_tab(self):
         layout = QVBoxLayout(self.update_tab)
         layout.setContentsMargins(5, 5, 5, 5)
         layout.setSpacing(5)
-        self.update_package_list = QListWidget()
-        self.update_package_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        self.update_model = PkgListModel(self)
+        self.update_package_list = QListView()
+        self.update_package_list.setModel(self.update_model)
+        self.update_package_list.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.update_package_list.setUniformItemSizes(True)
         layout.addWidget(self.update_package_list)
         button_layout = QHBoxLayout()
         self.update_selected_button = QPushButton(QIcon.fromTheme("system-software-update"), " Update Selected") # Add icon
@@ -364,7 +817,7 @@ class GentooPackageManagerGUI(QMainWindow):
         button_layout.addWidget(self.update_all_button)
         layout.addLayout(button_layout)
         # Initial state message
-        self.update_package_list.addItem("Loading...")
+        self.update_model.set_items(["Loading..."])
         self.update_tab_text(self.update_tab_index, "updates", None) # Show (?) initially
 
     def _setup_output_tab(self):
@@ -378,153 +831,73 @@ class GentooPackageManagerGUI(QMainWindow):
         console_palette.setColor(QPalette.ColorRole.Base, QColor(30, 30, 30)) # Dark background
         console_palette.setColor(QPalette.ColorRole.Text, Qt.GlobalColor.lightGray) # Light text
         self.output_console.setPalette(console_palette)
+        # Bound the document: oldest lines are dropped so appends stay cheap in long emerge runs
+        self.output_console.document().setMaximumBlockCount(CONSOLE_MAX_BLOCKS)
+        self.output_console.setPlaceholderText(f"Command output appears here (the last {CONSOLE_MAX_BLOCKS} lines are kept).")
+        # Shared cursor used to append worker output at the end of the document
+        self._out_cursor = QTextCursor(self.output_console.document())
+        self._plain_format = QTextCharFormat() # Default format, resets colors left by HTML output
+        # Worker output is queued and written on a short timer, so bursts become one insert
+        self._pending_console_chunks = []
+        self._console_flush_timer = QTimer(self)
+        self._console_flush_timer.setSingleShot(True)
+        self._console_flush_timer.setInterval(CONSOLE_FLUSH_MS)
+        self._console_flush_timer.timeout.connect(self._flush_console)
         layout.addWidget(self.output_console)
 
     def filter_browse_packages(self):
+        if not self._browse_loaded:
+            return # Keep the loading/error message until the list has arrived
         filter_text = self.browse_search_input.text().strip().lower()
-        self.browse_package_list.clear()
-        # Check if the list has been populated
-        if hasattr(self, 'all_available_package_atoms') and self.all_available_package_atoms:
+        if self.all_available_package_atoms:
             if not filter_text:
-                # Display all if no filter
-                self.browse_package_list.addItems(self.all_available_package_atoms)
+                # Display all if no filter (the model references the list, no copy)
+                self.browse_model.set_items(self.all_available_package_atoms)
             else:
                 # Apply filter
-                matching_items = [pkg for pkg in self.all_available_package_atoms if filter_text in pkg.lower()]
-                self.browse_package_list.addItems(matching_items)
-        elif not filter_text: # Show loading/empty message only if list not populated and no filter
-             # Avoid showing "Loading..." if list is truly empty after loading
-            if not self.all_available_package_atoms and self.current_worker and self.current_worker.isRunning():
-                 self.browse_package_list.addItem("Loading...")
-            elif not self.all_available_package_atoms:
-                 self.browse_package_list.addItem("No available packages found or list failed to load.")
+                atoms = self.all_available_package_atoms
+                if self.all_available_package_atoms_np is not None:
+                    # Substring search runs in C over the whole array
+                    np = load_numpy() # Already imported by index_available; cached
+                    mask = np.char.find(self.all_available_package_atoms_np, filter_text) >= 0
+                    matching_items = [atoms[i] for i in np.flatnonzero(mask)]
+                else:
+                    matching_items = [atoms[i] for i, lc in enumerate(self.all_available_package_atoms_lc) if filter_text in lc]
+                self.browse_model.set_items(matching_items)
+        elif not filter_text: # Show empty message only if nothing was loaded and no filter
+            self.browse_model.set_items(["No available packages found."])
+        else:
+            self.browse_model.set_items([])
 
 
     def filter_installed_packages(self):
+        if not self._installed_loaded:
+            return # Keep the loading/error message until the list has arrived
         filter_text = self.installed_search_input.text().strip().lower()
-        self.installed_package_list.clear()
-        if hasattr(self, 'installed_packages') and self.installed_packages:
+        if self.installed_packages:
             if not filter_text:
-                self.installed_package_list.addItems(self.installed_packages)
+                self.installed_model.set_items(self.installed_packages)
             else:
-                matching_items = [pkg for pkg in self.installed_packages if filter_text in pkg.lower()]
-                self.installed_package_list.addItems(matching_items)
-        elif not filter_text: # Show loading/empty message only if list not populated and no filter
-            if not self.installed_packages and self.current_worker and self.current_worker.isRunning():
-                self.installed_package_list.addItem("Loading...")
-            elif not self.installed_packages:
-                self.installed_package_list.addItem("No installed packages found or list failed to load.")
+                packages = self.installed_packages
+                matching_items = [packages[i] for i, lc in enumerate(self.installed_packages_lc) if filter_text in lc]
+                self.installed_model.set_items(matching_items)
+        elif not filter_text: # Show empty message only if nothing was loaded and no filter
+            self.installed_model.set_items(["No installed packages found."])
+        else:
+            self.installed_model.set_items([])
 
 
     def apply_dark_mode(self):
-        dark_palette = QPalette()
-        # Base Colors
-        dark_palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53)) # Main window background
-        dark_palette.setColor(QPalette.ColorRole.WindowText, Qt.GlobalColor.white) # Text on window
-        dark_palette.setColor(QPalette.ColorRole.Base, QColor(42, 42, 42)) # Input fields, list backgrounds
-        dark_palette.setColor(QPalette.ColorRole.AlternateBase, QColor(66, 66, 66)) # Alternate row color (if used)
-        dark_palette.setColor(QPalette.ColorRole.ToolTipBase, Qt.GlobalColor.black)
-        dark_palette.setColor(QPalette.ColorRole.ToolTipText, Qt.GlobalColor.white)
-        dark_palette.setColor(QPalette.ColorRole.Text, Qt.GlobalColor.white) # General text in widgets
-        dark_palette.setColor(QPalette.ColorRole.Button, QColor(53, 53, 53)) # Button background
-        dark_palette.setColor(QPalette.ColorRole.ButtonText, Qt.GlobalColor.white) # Button text
-        dark_palette.setColor(QPalette.ColorRole.BrightText, Qt.GlobalColor.red) # e.g., text in critical message boxes
-
-        # Highlight Colors
-        dark_palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218)) # Blue highlight for selected items
-        dark_palette.setColor(QPalette.ColorRole.HighlightedText, Qt.GlobalColor.white) # Text in highlighted items
-
-        # Disabled Colors
-        dark_palette.setColor(QPalette.ColorRole.PlaceholderText, QColor(127, 127, 127)) # Placeholder text in line edits
-        dark_palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text, QColor(127, 127, 127))
-        dark_palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, QColor(127, 127, 127))
-        dark_palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.WindowText, QColor(127, 127, 127))
-        dark_palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Highlight, QColor(80, 80, 80)) # Disabled selection color
-        dark_palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.HighlightedText, QColor(127, 127, 127))
-
         app = QApplication.instance()
         if app: # Ensure app exists
-            app.setPalette(dark_palette)
-            app.setStyleSheet("""
-                QToolTip {
-                    color: #ffffff; /* White text */
-                    background-color: #2a82da; /* Blue background */
-                    border: 1px solid white; /* White border */
-                    padding: 2px;
-                }
-                QStatusBar {
-                    color: #ffffff; /* White text in status bar */
-                }
-                QProgressBar {
-                    border: 1px solid #666666; /* Gray border */
-                    border-radius: 5px;
-                    text-align: center; /* Center text if shown */
-                    color: #ffffff; /* White text */
-                    background-color: #424242; /* Dark gray background */
-                }
-                QProgressBar::chunk {
-                    background-color: #4287f5; /* Blue progress chunk */
-                    border-radius: 4px; /* Slightly rounded chunk */
-                    margin: 1px; /* Small margin around chunk */
-                }
-                QListWidget, QTreeWidget { /* Apply to both list and tree widgets */
-                    background-color: QColor(42, 42, 42); /* Match Base color */
-                    /* Consider adding alternate row colors if desired */
-                    /* alternate-background-color: QColor(66, 66, 66); */
-                }
-                 QTreeView::item:hover, QListWidget::item:hover {
-                     background-color: QColor(60, 60, 60); /* Slightly lighter on hover */
-                 }
-                QTreeView::item:selected, QListWidget::item:selected {
-                     background-color: #2a82da; /* Match Highlight color */
-                     color: white; /* Ensure text is white when selected */
-                 }
-                QTabWidget::pane { /* The area where tab content is shown */
-                    border: none; /* No border around the content pane */
-                 }
-                QTabWidget::tab-bar {
-                    alignment: left; /* Align tabs to the left */
-                }
-                QTabBar::tab {
-                    background: QColor(66, 66, 66); /* Darker gray for inactive tabs */
-                    border: 1px solid #444; /* Slightly darker border */
-                    border-bottom: none; /* No border at bottom for inactive */
-                    border-top-left-radius: 4px;
-                    border-top-right-radius: 4px;
-                    min-width: 10ex; /* Minimum width */
-                    padding: 5px; /* Padding around text */
-                    margin-right: 1px; /* Small space between tabs */
-                    color: #dddddd; /* Lighter gray text for inactive/hover */
-                }
-                QTabBar::tab:hover {
-                    background: QColor(80, 80, 80); /* Slightly lighter on hover */
-                }
-                QTabBar::tab:selected {
-                    background: QColor(53, 53, 53); /* Match window background for selected */
-                    border-color: #444;
-                    border-bottom: none; /* Selected tab 'connects' to pane */
-                    color: #ffffff; /* White text for selected */
-                }
-                QTabBar::tab:!selected {
-                     margin-top: 2px; /* Make inactive tabs slightly lower */
-                     background: QColor(70, 70, 70); /* Slightly different shade */
-                     color: #aaaaaa; /* More subdued text */
-                 }
-                QLineEdit {
-                    background-color: QColor(42, 42, 42); /* Match Base */
-                    padding: 2px;
-                    border: 1px solid #666666; /* Gray border */
-                    border-radius: 3px;
-                }
-                 QTextEdit { /* Style for the output console */
-                     background-color: QColor(30, 30, 30); /* Very dark background */
-                     color: #f0f0f0; /* Off-white text */
-                     border: 1px solid #444; /* Dark border */
-                 }
-            """)
+            app.setPalette(_dark_palette())
+            app.setStyleSheet(_DARK_STYLESHEET)
 
     def update_tab_text(self, tab_index, base_text_key, count):
         """Updates the text of a tab, adding the item count."""
+        if tab_index in self._tab_counts and self._tab_counts[tab_index] == count:
+            return # Same count already shown, skip the relayout/repaint
+        self._tab_counts[tab_index] = count
         base_text = self.tab_base_texts.get(base_text_key, "Tab")
         if count is None:
             display_text = f"{base_text} (?)" # Indicate loading/unknown
@@ -535,146 +908,161 @@ class GentooPackageManagerGUI(QMainWindow):
         except Exception as e:
             print(f"Error updating tab text for index {tab_index}: {e}") # Debug potential issues
 
+    def show_status(self, message, timeout=0):
+        """Shows a status bar message, skipping the repaint if it is already displayed."""
+        if not timeout and message == self.status_bar.currentMessage():
+            return # Same permanent message; timed ones are re-shown to restart their timer
+        self.status_bar.showMessage(message, timeout)
+
 
-    # --- Sequential Loading Logic ---
-    def _start_next_load_step(self, step):
-        """Starts the next step in the initial data loading sequence."""
-        if step == self.LOAD_STEP_INSTALLED:
-            self.refresh_installed_packages(callback_arg=self.LOAD_STEP_AVAILABLE) # Pass next step
-        elif step == self.LOAD_STEP_AVAILABLE:
-            self.load_all_available_packages(callback_arg=self.LOAD_STEP_UPDATES) # Pass next step
-        elif step == self.LOAD_STEP_UPDATES:
-            self.refresh_updates(callback_arg=self.LOAD_STEP_COMPLETE) # Pass next step
-        elif step == self.LOAD_STEP_COMPLETE:
-            self.status_bar.showMessage("Initial loading complete.", 5000)
-            # Ensure progress bar is hidden and cancel button disabled
-            self.progress_bar.setVisible(False)
-            self.cancel_button.setEnabled(False)
-            self.current_worker = None # Ensure worker is cleared
-
-    # --- Backend Interaction (Generic Task Runner for Sequential Load) ---
+    # --- Concurrent Loading Logic ---
+    def _start_list_loads(self):
+        """Starts the installed, available and update list loads in parallel.
+
+        The three commands are independent, so total load time is that of the
+        slowest one rather than the sum of all three.
+        """
+        self._loading_lists = True
+        self.refresh_installed_packages()
+        self.load_all_available_packages()
+        self.refresh_updates()
+
+    # --- Worker Tracking ---
+    def _track_worker(self, worker):
+        """Registers a worker as active until it emits finished or error.
+
+        Connect this before any other handler so a worker is no longer counted
+        as busy once its handlers (which may start new work) run.
+        """
+        self._active_workers.add(worker)
+        if isinstance(worker, QThread):
+            # Parent the QThread so Qt, not the Python reference, keeps it alive until run() returns
+            # (pool runnables are owned and deleted by QThreadPool instead)
+            worker.setParent(self)
+            worker.finished.connect(worker.deleteLater)
+        worker.signals.finished.connect(lambda _cb_arg, w=worker: self._worker_done(w))
+        worker.signals.error.connect(lambda _msg, _cb_arg, _returncode, w=worker: self._worker_done(w))
+
+    def _worker_done(self, worker):
+        """Drops a worker from the active set and cleans up the UI once none remain."""
+        self._active_workers.discard(worker)
+        if self._active_workers:
+            return
+        if self._close_when_idle:
+            self._finish_close() # Exit was requested while this work was running
+            return
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setEnabled(False)
+        if self._loading_lists:
+            self._loading_lists = False
+            self.show_status("Initial loading complete.", 5000)
+
+    def _action_running(self):
+        """Returns True if a user action (emerge via CommandWorker) is in progress."""
+        return any(isinstance(w, CommandWorker) for w in self._active_workers)
+
+    # --- Backend Interaction (Generic Task Runner for List Loads) ---
     def run_generic_task(self, command_list, parser_func, on_result, on_finished_callback, on_error_callback, status_message, callback_arg=None):
-        """Runs a generic command, managing the single self.current_worker."""
-        # *** Check if a worker is ALREADY running ***
-        if self.current_worker and self.current_worker.isRunning():
-            # This case should ideally not happen with strict sequential loading,
-            # but handle it defensively. Log it, maybe show error.
-            print(f"Warning: Tried to start task '{' '.join(command_list)}' while another was running.")
-            # Optionally show error to user:
-            # self.show_error("Error: Tried to start a data loading task while another was running.\nPlease wait.")
-            # Decide how to proceed: either skip this step or wait?
-            # For sequential load, skipping might be better than getting stuck.
-            # We'll call the error handler which should then call the next step.
-            on_error_callback("Internal Error: Task conflict during sequential load.", callback_arg)
+        """Runs a generic command in its own worker, alongside any other list loads."""
+        # *** Refuse duplicates and do not read package data while emerge is modifying it ***
+        if self._action_running() or any(w.command_list == command_list for w in self._active_workers):
+            print(f"Warning: Tried to start task '{' '.join(command_list)}' while it or an action was running.")
+            on_error_callback("Internal Error: Task conflict during list load.", callback_arg)
             return
 
-        self.status_bar.showMessage(status_message)
+        self._start_pool_worker(GenericWorker(command_list, parser_func, callback_arg), # Pass callback_arg
+                                on_result, on_finished_callback, on_error_callback, status_message)
+
+    def _start_pool_worker(self, worker, on_result, on_finished_callback, on_error_callback, status_message):
+        """Shows the loading state, then tracks and starts a GenericWorker or FunctionWorker."""
+        self.show_status(status_message)
         self.progress_bar.setRange(0, 0) # Indeterminate for loading
         self.progress_bar.setVisible(True)
         self.cancel_button.setEnabled(True) # Enable cancel for loading tasks too
 
-        # Create and store the worker instance
-        self.current_worker = GenericWorker(command_list, parser_func, callback_arg) # Pass callback_arg
+        self._track_worker(worker)
 
         # Connect signals
-        self.current_worker.signals.finished.connect(on_finished_callback) # Will call _generic_finished
-        self.current_worker.signals.error.connect(on_error_callback)     # Will call _generic_error
-        self.current_worker.signals.result.connect(on_result)
-        # self.current_worker.signals.progress.connect(self._command_progress) # Generic worker doesn't usually emit line-by-line progress
+        worker.signals.finished.connect(on_finished_callback) # Will call _generic_finished
+        worker.signals.error.connect(on_error_callback)     # Will call _generic_error
+        worker.signals.result.connect(on_result)
 
-        self.current_worker.start()
+        worker.start()
 
     def _generic_finished(self, callback_arg):
         """Called when a GenericWorker finishes successfully."""
-        # Don't hide progress bar or disable cancel immediately, wait for sequence end
-        # The sequence end (LOAD_STEP_COMPLETE) handles UI cleanup.
-        print(f"Generic task finished, proceeding to step: {callback_arg}") # Debug log
-        worker_ref = self.current_worker # Keep ref temporarily if needed
-        self.current_worker = None # Clear worker *before* starting next step
-        # Trigger the next loading step
-        self._start_next_load_step(callback_arg)
+        # UI cleanup happens in _worker_done once the last worker is done.
+        print("Generic task finished.") # Debug log
 
     def _generic_error(self, error_msg, callback_arg):
         """Called when a GenericWorker fails."""
-        print(f"Generic task error: {error_msg}, proceeding to step: {callback_arg}") # Debug log
-        # Don't hide progress bar/cancel yet if part of sequence.
+        print(f"Generic task error: {error_msg}") # Debug log
         # The error message should be shown in the respective list or console.
 
         # Check if it was a cancellation
         if "Operation Cancelled" in error_msg:
-            self.status_bar.showMessage("Load operation Cancelled.", 5000)
-            self.output_console.append(f"\n{'-'*20}\nLoad Operation Cancelled by User.")
-            self.output_console.ensureCursorVisible()
-            # Stop the sequence on cancel
-            self.progress_bar.setVisible(False)
-            self.cancel_button.setEnabled(False)
-            self.current_worker = None
-            return # Don't proceed to next step if cancelled
+            self.show_status("Load operation Cancelled.", 5000)
+            self._console_message(f"\n{'-'*20}\nLoad Operation Cancelled by User.")
+            return
 
         # Log the specific error to the console
-        self.output_console.append(f"\n{'-'*20}\nERROR during data load:\n{error_msg}")
-        self.output_console.ensureCursorVisible()
+        self._console_message(f"\n{'-'*20}\nERROR during data load:\n{error_msg}")
 
         # Show a brief status bar message
-        self.status_bar.showMessage(f"Load failed: {error_msg.splitlines()[0]}...", 6000)
+        first_line = error_msg.partition('\n')[0] # Only the first line, without splitting the whole message
+        self.show_status(f"Load failed: {first_line}...", 6000)
 
         # Maybe show a dialog for critical errors like command not found?
         if "Command not found" in error_msg:
              self.show_error(f"Data Loading Failed:\n{error_msg}\n\nPlease ensure the necessary tools (like eix, equery) are installed and in your PATH.")
-             # Stop sequence if essential command missing
-             self.progress_bar.setVisible(False)
-             self.cancel_button.setEnabled(False)
-             self.current_worker = None
-             return
-
-
-        # Clear the worker reference *before* potentially starting the next step
-        worker_ref = self.current_worker # Keep ref temporarily if needed
-        self.current_worker = None
-
-        # Trigger the next loading step *even on error* so the sequence continues
-        # and subsequent lists might still load.
-        self._start_next_load_step(callback_arg)
 
 
     # --- Backend Interaction (Emerge Commands - User Actions) ---
     def run_emerge_command(self, command_list, on_finished_callback, on_error_callback, status_message, use_pkexec=True):
-        """Runs an emerge command, managing the single self.current_worker."""
-        if self.current_worker and self.current_worker.isRunning():
+        """Runs an emerge command; refused while any other worker is active."""
+        if self._active_workers:
             self.show_error("Another operation is already in progress. Please wait or cancel.")
             return
+        if use_pkexec and not self._check_pkexec():
+            return
 
-        self.status_bar.showMessage(status_message)
+        self.show_status(status_message)
         self.progress_bar.setRange(0, 0) # Emerge output is complex, use indeterminate
         self.progress_bar.setVisible(True)
         self.cancel_button.setEnabled(True)
         self.tabs.setCurrentWidget(self.output_tab) # Switch to output tab
 
         # Append command start to console
-        self.output_console.append(f"\n{'-'*30}\nExecuting: {'pkexec ' if use_pkexec else ''}{' '.join(command_list)}\n{'-'*30}\n")
-        self.output_console.ensureCursorVisible()
+        self._console_message(f"\n{'-'*30}\nExecuting: {'pkexec ' if use_pkexec else ''}{' '.join(command_list)}\n{'-'*30}\n")
 
-        # Create and store the worker instance
-        self.current_worker = CommandWorker(command_list, use_pkexec) # No callback arg needed for simple actions
+        worker = CommandWorker(command_list, use_pkexec) # No callback arg needed for simple actions
+        self._track_worker(worker)
 
         # Connect signals to specific handlers for user actions
         # Use lambda to pass the specific callback to the generic handler
-        self.current_worker.signals.finished.connect(lambda cb_arg: self._command_action_finished(on_finished_callback))
-        self.current_worker.signals.error.connect(lambda error_msg, cb_arg: self._command_action_error(error_msg, on_error_callback))
-        self.current_worker.signals.progress.connect(self._command_progress)
+        worker.signals.finished.connect(lambda cb_arg: self._command_action_finished(on_finished_callback))
+        worker.signals.error.connect(lambda error_msg, cb_arg: self._command_action_error(error_msg, on_error_callback))
+        worker.signals.progress.connect(self._command_progress)
 
-        self.current_worker.start()
+        worker.start()
+
+    def _check_pkexec(self):
+        """Returns True if pkexec is available, warning the user (instead of at startup) if not."""
+        if TOOLS['pkexec'] is None:
+            QMessageBox.warning(self, "Missing pkexec",
+                                "The 'pkexec' command was not found.\nActions like install, update, sync, or uninstall need it to gain root privileges.\n\nPlease ensure PolicyKit is installed and configured.")
+            return False
+        return True
 
     def _command_action_finished(self, callback):
         """Handler for successful user action command completion."""
-        self.status_bar.showMessage("Operation completed successfully.", 5000)
+        self.show_status("Operation completed successfully.", 5000)
         self.progress_bar.setVisible(False)
         self.cancel_button.setEnabled(False)
+        self.refresh_disk_space(force=True) # emerge is what changes disk usage, so refresh right away
         # Append success message to console
-        self.output_console.append(f"\n{'-'*20}\nOperation finished successfully.")
-        self.output_console.ensureCursorVisible()
+        self._console_message(f"\n{'-'*20}\nOperation finished successfully.")
 
-        self.current_worker = None # Clear worker reference
         if callback:
             try:
                 callback() # Execute the post-action callback (e.g., refresh lists)
@@ -687,21 +1075,20 @@ class GentooPackageManagerGUI(QMainWindow):
         """Handler for failed user action command completion."""
         self.progress_bar.setVisible(False)
         self.cancel_button.setEnabled(False)
+        self.refresh_disk_space(force=True) # A failed or cancelled emerge may still have written files
 
         # Append error details to console
         if "Operation Cancelled" in error_msg:
-            self.status_bar.showMessage("Operation Cancelled.", 5000)
-            self.output_console.append(f"\n{'-'*20}\nOperation Cancelled by User.")
+            self.show_status("Operation Cancelled.", 5000)
+            self._console_message(f"\n{'-'*20}\nOperation Cancelled by User.")
         else:
             # Log full error to console first
-            self.output_console.append(f"\n{'-'*20}\nERROR:\n{error_msg}")
+            self._console_message(f"\n{'-'*20}\nERROR:\n{error_msg}")
+            first_line = error_msg.partition('\n')[0] # Only the first line, without splitting the whole message
             # Show user-friendly dialog
-            self.show_error(f"Operation Failed:\n{error_msg.splitlines()[0]}...\n\nSee Output Console for details.")
+            self.show_error(f"Operation Failed:\n{first_line}...\n\nSee Output Console for details.")
             # Update status bar
-            self.status_bar.showMessage(f"Operation failed: {error_msg.splitlines()[0]}", 6000)
-
-        self.output_console.ensureCursorVisible()
-        self.current_worker = None # Clear worker reference
+            self.show_status(f"Operation failed: {first_line}", 6000)
 
         # Optional: Execute an error callback if provided (e.g., to re-enable buttons)
         # Only call if it wasn't a user cancellation.
@@ -713,57 +1100,80 @@ class GentooPackageManagerGUI(QMainWindow):
 
 
     def _command_progress(self, progress_text):
-        """Handles progress updates (stdout lines) from workers (both types)."""
-        cursor = self.output_console.textCursor()
+        """Handles progress updates (blocks of stdout lines) from workers (both types)."""
+        self._pending_console_chunks.append(progress_text)
+        if not self._console_flush_timer.isActive():
+            self._console_flush_timer.start()
+
+    def _console_message(self, text):
+        """Appends a status message to the console, after any worker output still queued."""
+        self._flush_console(scroll=False)
+        self.output_console.append(text)
+        self._console_flush_timer.start() # Scroll on the next flush, not per message
+
+    def _flush_console(self, scroll=True):
+        """Writes all queued worker output to the console with a single insert."""
+        self._console_flush_timer.stop()
+        if self._pending_console_chunks:
+            progress_text = '\n'.join(self._pending_console_chunks)
+            self._pending_console_chunks.clear()
+            self._insert_console_output(progress_text)
+        if scroll:
+            self.output_console.ensureCursorVisible() # Scroll to the bottom, once per flush
+
+    def _insert_console_output(self, progress_text):
+        """Appends a block of worker output lines at the end of the console."""
+        cursor = self._out_cursor
         cursor.movePosition(QTextCursor.MoveOperation.End)
-        self.output_console.setTextCursor(cursor)
-
-        if ANSI_ENABLED:
-            # Convert ANSI codes to HTML for rich text display
-            html_output = conv.convert(progress_text, full=False)
-            self.output_console.insertHtml(html_output + "<br>") # Add line break
-        elif ansi_escape:
-            # Simple removal of ANSI codes if ansi2html is not available
-            cleaned_text = ansi_escape.sub('', progress_text)
-            self.output_console.insertPlainText(cleaned_text + "\n") # Append plain text + newline
+
+        # One helper call decides the path for the whole block: a single escape scan, then
+        # either the converter (one call for the whole flush, so color state carries across
+        # lines and clean lines are HTML-escaped too), the fallback regex, or nothing at all
+        display_text, is_html = strip_or_convert_ansi(progress_text)
+        if is_html:
+            # white-space:pre turns each newline into its own text block; <br> would grow one huge block (quadratic inserts)
+            cursor.insertHtml(f'<span style="white-space:pre">{display_text}\n</span>')
         else:
-            # Fallback if even basic regex fails
-             self.output_console.insertPlainText(progress_text + "\n")
+            # Plain block in the default format
+            cursor.insertText(display_text + "\n", self._plain_format) # Append plain text + newline
 
-        self.output_console.ensureCursorVisible() # Scroll to the bottom
 
+    def _worker_state(self):
+        """Summarises the active workers as one WorkerState (GUI thread only)."""
+        if not self._active_workers:
+            return WorkerState.IDLE
+        if all(w.state is WorkerState.CANCELLING for w in self._active_workers):
+            return WorkerState.CANCELLING
+        return WorkerState.RUNNING
 
     def cancel_operation(self):
-        """Attempts to stop the currently running worker."""
-        if self.current_worker and self.current_worker.isRunning():
-            self.status_bar.showMessage("Attempting to cancel operation...")
-            self.current_worker.stop()
+        """Attempts to stop all running workers."""
+        state = self._worker_state()
+        if state is WorkerState.CANCELLING:
+            self.show_status("Cancellation already in progress...", 3000)
+        elif state is WorkerState.RUNNING:
+            self.show_status("Attempting to cancel operation...")
+            for worker in list(self._active_workers):
+                worker.stop()
             self.cancel_button.setEnabled(False) # Disable button immediately
             # Let the worker's error/finished signal handlers manage the rest of the UI cleanup (like hiding progress bar)
         else:
-            self.status_bar.showMessage("No operation running to cancel.", 3000)
+            self.show_status("No operation running to cancel.", 3000)
 
 
-    def get_selected_package_atoms(self, list_widget):
-        """Extracts package atoms (category/name) from selected list items."""
-        items = list_widget.selectedItems()
+    def get_selected_package_atoms(self, list_view):
+        """Extracts package atoms (category/name) from selected rows of a list view/widget."""
+        match_atom = _ATOM_RE.match # Bound once for the loop
         results = set() # Use a set to avoid duplicates easily
-        # Regex to capture category/package, ignoring version or flags
-        # Handles formats like: cat/pkg, cat/pkg-1.2.3, cat/pkg -> 1.2.4 [Update]
-        atom_pattern = re.compile(r'^([\w.+-]+/[\w.+-]+)')
-        for item in items:
-            text = item.text()
-            match = atom_pattern.match(text)
+        for text in (index.data() for index in list_view.selectionModel().selectedIndexes()):
+            match = match_atom(text)
             if match:
-                results.add(match.group(1))
-            else:
+                results.add(sys.intern(match.group(1)))
+            elif '/' in text and ' ' not in text:
                 # Fallback: if no version/flags, assume the whole text is the atom
-                # if it looks like one (contains '/')
-                if '/' in text and ' ' not in text:
-                     results.add(text)
-                else:
-                    print(f"Warning: Could not parse package atom from selected item: {text}")
-        return sorted(list(results))
+                # if it looks like one (contains '/'); anything else (status rows) is skipped
+                results.add(sys.intern(text))
+        return sorted(results)
 
 
     # --- Specific Actions ---
@@ -779,7 +1189,7 @@ class GentooPackageManagerGUI(QMainWindow):
         if msg_box.exec() == QMessageBox.StandardButton.Yes:
             # Use run_emerge_command for user action
             self.run_emerge_command(
-                ['emerge', '--sync'],
+                [tool_path('emerge'), '--sync'],
                 on_finished_callback=self._sync_finished, # Callback after sync finishes
                 on_error_callback=None, # Default error message handling is fine
                 status_message="Running emerge --sync...",
@@ -789,63 +1199,77 @@ class GentooPackageManagerGUI(QMainWindow):
     def _sync_finished(self):
         """Callback after emerge --sync completes successfully."""
         # Sync finished, now REFRESH the updates list is the most logical next step
-        self.status_bar.showMessage("Sync finished. Refreshing updates list...", 3000)
-        # Directly call refresh_updates. It will handle the self.current_worker check.
-        # Pass LOAD_STEP_COMPLETE so it doesn't try to chain further loads automatically.
-        # This assumes refresh_updates doesn't *require* prior steps to have run in this specific call context.
-        self.refresh_updates(callback_arg=self.LOAD_STEP_COMPLETE)
+        self.show_status("Sync finished. Refreshing updates list...", 3000)
+        # Directly call refresh_updates. It will handle the active worker check.
+        self.refresh_updates()
 
 
     def refresh_all(self):
-        """Starts the sequential refresh process from the beginning."""
-        if self.current_worker and self.current_worker.isRunning():
+        """Schedules a reload of all package lists; bursts of calls collapse into one refresh."""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        QTimer.singleShot(0, self._run_pending_refresh) # Runs once control returns to the event loop
+
+    def _run_pending_refresh(self):
+        """Reloads all package lists (concurrently)."""
+        self._refresh_pending = False
+        if self._active_workers:
             self.show_error("Cannot refresh: An operation is already in progress.\nPlease wait or cancel the current operation.")
             return
 
-        self.status_bar.showMessage("Starting full refresh sequence...", 0)
+        self.show_status("Starting full refresh...", 0)
         # Clear lists and show loading indicators immediately
-        self.installed_package_list.clear(); self.installed_package_list.addItem("Loading...")
-        self.browse_package_list.clear(); self.browse_package_list.addItem("Loading...")
-        self.update_package_list.clear(); self.update_package_list.addItem("Loading...")
+        self.installed_model.set_items(["Loading..."])
+        self.browse_model.set_items(["Loading..."])
+        self.update_model.set_items(["Loading..."])
         self.update_tab_text(self.installed_tab_index, "installed", None)
         self.update_tab_text(self.browse_tab_index, "browse", None)
         self.update_tab_text(self.update_tab_index, "updates", None)
 
-        # Start the first step of the loading sequence
-        self._start_next_load_step(self.LOAD_STEP_INSTALLED)
+        # Start all list loads
+        self._start_list_loads()
 
 
     # --- Data Loading Functions ---
 
-    def load_all_available_packages(self, callback_arg=None):
+    def load_all_available_packages(self):
         """
         Loads all available package atoms using 'eix -c --only-names */*'.
-        Requires eix to be installed.
+        Requires eix to be installed. The parsed list is cached on disk and
+        reused, without running eix, until the eix database changes.
         """
         self.update_tab_text(self.browse_tab_index, "browse", None)
-        self.browse_package_list.clear() # Clear previous content/loading message
-        self.browse_package_list.addItem("Loading available packages (using eix)...")
+        self._browse_loaded = False
+        self.browse_model.set_items(["Loading available packages (using eix)..."]) # Replace previous content
 
         def parse_eix_output(lines):
             """Parses the simple 'category/package' output of eix."""
-            packages = set()
-            for line in lines:
-                # Basic validation: must contain '/' and not be empty/whitespace
-                if line and '/' in line:
-                    packages.add(line.strip())
-            return sorted(list(packages))
-
-        def on_load_available_result(packages):
+            # Basic validation: must contain '/' and not be empty/whitespace.
+            # eix already prints atoms in sorted order, so dedup in place instead of set + sort.
+            # Atoms are interned so the same string is shared with the update list
+            return list(dict.fromkeys(sys.intern(line.strip()) for line in lines if line and '/' in line))
+
+        def index_available(packages):
+            """Builds the filter indexes for the atom list (always runs in a worker thread)."""
+            packages_lc = [p.lower() for p in packages] # Lower-case once, not per keystroke
+            np = load_numpy() if packages else None
+            packages_np = np.array(packages_lc, dtype=str) if np is not None else None
+            return {"atoms": packages, "lc": packages_lc, "np": packages_np}
+
+        def on_load_available_result(available):
             """Callback when available package list is loaded successfully."""
-            self.all_available_package_atoms = packages # Store the loaded atoms
-            self.browse_package_list.clear()
+            self.all_available_package_atoms = available["atoms"] # Store the loaded atoms
+            self.all_available_package_atoms_lc = available["lc"]
+            self.all_available_package_atoms_np = available["np"]
+            self._browse_loaded = True
             count = len(self.all_available_package_atoms)
             if count > 0:
-                self.browse_package_list.addItems(self.all_available_package_atoms)
-                self.status_bar.showMessage(f"Loaded {count} available packages.", 3000)
+                self.browse_model.set_items(self.all_available_package_atoms)
+                self.show_status(f"Loaded {count} available packages.", 3000)
             else:
-                self.browse_package_list.addItem("No available packages found (check eix?).")
-                self.status_bar.showMessage("No available packages found.", 3000)
+                self.browse_model.set_items(["No available packages found (check eix?)."])
+                self.show_status("No available packages found.", 3000)
 
             self.update_tab_text(self.browse_tab_index, "browse", count)
             # Apply filter in case user typed while loading
@@ -853,46 +1277,70 @@ class GentooPackageManagerGUI(QMainWindow):
 
         # Custom error handler for this step
         def on_load_available_error(error_msg, cb_arg):
-            self.browse_package_list.clear()
-            self.browse_package_list.addItem(f"Error loading available packages.")
-            # Let the generic error handler manage console logging, status bar, and proceeding
+            self.browse_model.set_items(["Error loading available packages."])
+            # Let the generic error handler manage console logging and status bar
             self._generic_error(error_msg, cb_arg) # Call generic handler
 
-        # Use the generic task runner
-        self.run_generic_task(
-            command_list=['eix', '-c', '--only-names', '*/*'], # Use eix
-            parser_func=parse_eix_output,                     # Use eix parser
-            on_result=on_load_available_result,
-            on_finished_callback=self._generic_finished,      # Generic handler to continue sequence
-            on_error_callback=on_load_available_error,        # Use custom error handler
-            status_message="Loading available packages (eix)...",
-            callback_arg=callback_arg # Pass the next step info
-        )
+        cache_key = _available_cache_key()
+
+        def load_and_index_cache():
+            """Worker-side: read and index the cached list, or return None if eix has to run."""
+            packages = load_available_cache(cache_key)
+            return index_available(packages) if packages is not None else None
+
+        def on_cache_result(available):
+            """Shows the cached list, or falls back to eix if the cache is missing or stale."""
+            if available is not None:
+                on_load_available_result(available)
+            else:
+                load_from_eix()
+
+        def parse_and_index(lines):
+            """Worker-side: parse, write the cache back for the next start, and index."""
+            packages = parse_eix_output(lines)
+            save_available_cache(cache_key, packages)
+            return index_available(packages)
+
+        def load_from_eix():
+            # Use the generic task runner
+            self.run_generic_task(
+                command_list=[tool_path('eix'), '-c', '--only-names', '*/*'], # Use eix
+                parser_func=parse_and_index,                      # Use eix parser (runs in the worker)
+                on_result=on_load_available_result,
+                on_finished_callback=self._generic_finished,      # Generic success handler
+                on_error_callback=on_load_available_error,        # Use custom error handler
+                status_message="Loading available packages (eix)...",
+            )
 
+        # Skip eix entirely if the cached list is still valid (read and indexed off the GUI thread)
+        self._start_pool_worker(FunctionWorker(load_and_index_cache), on_cache_result, self._generic_finished,
+                                on_load_available_error, "Loading available packages...")
 
-    def refresh_installed_packages(self, callback_arg=None):
+
+    def refresh_installed_packages(self):
         """Loads installed packages using 'equery list --installed */*'."""
         self.update_tab_text(self.installed_tab_index, "installed", None)
-        self.installed_package_list.clear()
-        self.installed_package_list.addItem("Loading installed packages...")
+        self._installed_loaded = False
+        self.installed_model.set_items(["Loading installed packages..."])
 
         def parse_equery_installed(lines):
             """Parses 'equery list --installed' output (cat/pkg-ver)."""
-            # Filter out equery's status lines and empty lines
-            installed = sorted([line.strip() for line in lines if line and not line.startswith('[') and '/' in line])
-            return installed
+            # Filter out equery's status lines and empty lines (equery lists packages already sorted)
+            installed = list(dict.fromkeys(sys.intern(line.strip()) for line in lines if line and not line.startswith('[') and '/' in line))
+            return {"packages": installed, "lc": [p.lower() for p in installed]} # Filter index built in the worker too
 
-        def on_installed_result(packages):
+        def on_installed_result(installed):
             """Callback when installed packages are loaded."""
-            self.installed_packages = packages
-            self.installed_package_list.clear()
+            self.installed_packages = installed["packages"]
+            self.installed_packages_lc = installed["lc"]
+            self._installed_loaded = True
             count = len(self.installed_packages)
             if count > 0:
-                self.installed_package_list.addItems(self.installed_packages)
-                self.status_bar.showMessage(f"{count} installed packages loaded.", 3000)
+                self.installed_model.set_items(self.installed_packages)
+                self.show_status(f"{count} installed packages loaded.", 3000)
             else:
-                 self.installed_package_list.addItem("No installed packages found (check equery?).")
-                 self.status_bar.showMessage("No installed packages found.", 3000)
+                 self.installed_model.set_items(["No installed packages found (check equery?)."])
+                 self.show_status("No installed packages found.", 3000)
 
             self.update_tab_text(self.installed_tab_index, "installed", count)
             # Apply filter in case user typed while loading
@@ -900,57 +1348,41 @@ class GentooPackageManagerGUI(QMainWindow):
 
         # Custom error handler for this step
         def on_installed_error(error_msg, cb_arg):
-             self.installed_package_list.clear()
-             self.installed_package_list.addItem(f"Error loading installed packages.")
-             # Let the generic error handler manage console/status/proceeding
+             self.installed_model.set_items(["Error loading installed packages."])
+             # Let the generic error handler manage console/status
              self._generic_error(error_msg, cb_arg)
 
         # Use the generic task runner
         self.run_generic_task(
-            command_list=['equery', 'list', '--installed', '*/*'], # Command for installed
+            command_list=[tool_path('equery'), 'list', '--installed', '*/*'], # Command for installed
             parser_func=parse_equery_installed,
             on_result=on_installed_result,
             on_finished_callback=self._generic_finished, # Generic handler
             on_error_callback=on_installed_error,      # Custom handler for this step
             status_message="Loading installed packages...",
-            callback_arg=callback_arg # Pass next step
         )
 
 
-    def refresh_updates(self, callback_arg=None):
-        """Checks for updates using emerge -upvND @world."""
+    def refresh_updates(self):
+        """Checks for updates using emerge -upNDq @world (compact, uncolored output)."""
         self.update_tab_text(self.update_tab_index, "updates", None)
-        self.update_package_list.clear()
-        self.update_package_list.addItem("Checking for updates (emerge pretend)...")
-
-        # Regex to capture package atom and new version/flags from emerge output
-        update_pattern = re.compile(
-            r"\[ebuild\s+"          # Start of line
-            r"([NURD ]{1,2})"      # Flags (New, Update, Rebuild, Downgrade, Slot conflict?) - allow space too
-            r"[^\]]*?\]\s+"        # Rest of bracketed info and space
-            r"([\w.+-]+/[\w.+-]+)" # Package Atom (cat/pkg) - more robust chars allowed
-            r"-([\d.].*?)"          # Version (starts with digit, non-greedy)
-            r"(?:\s+USE=.*?)?"      # Optional USE flags part
-            r"(?:\s+CFLAGS=.*?)?"   # Optional CFLAGS part
-            r"(?:\s+LDFLAGS=.*?)?"  # Optional LDFLAGS part
-            r"(?:\s+REPO=.*?)?"     # Optional REPO part
-            r"(?:\s+SLOT=.*?)?"     # Optional SLOT part
-            r"(?:\s*->\s*([\w.+-/]+-[\d.]+.*?))?" # Optional new version/slot (-> target)
-            r"\s*$", re.IGNORECASE # Ignore case for flags, match end of line
-        )
+        self.update_model.set_items(["Checking for updates (emerge pretend)..."])
+
         # Simplified Flag mapping
         flag_map = {'U': 'Update', 'N': 'New', 'R': 'Rebuild', 'D': 'Downgrade', ' ': ' '}
 
         def parse_updates(lines):
-            """Parses 'emerge -upvND @world' output."""
-            updates_atoms = set()
-            updates_display_dict = {} # Use dict to handle potential duplicate atoms with different flags/versions
+            """Parses 'emerge -upNDq @world' output."""
+            updates_display_dict = {} # Atom -> display text; also dedups atoms seen with different flags/versions
 
             for line in lines:
-                if line.startswith('[ebuild'):
-                    match = update_pattern.search(line)
+                if line.startswith(_UPDATE_PREFIXES):
+                    head, _, rest = line.partition(']')
+                    flags = head[7:] # Flags (New, Update, Rebuild, Downgrade, ...) inside the brackets
+                    match = _UPDATE_REST_RE.match(rest)
                     if match:
-                        flags, pkg_cat_name, old_ver, new_ver_info = match.groups()
+                        pkg_cat_name, old_ver, new_ver_info = match.groups()
+                        pkg_cat_name = sys.intern(pkg_cat_name) # Shares the browse list's atom string
 
                         # Determine primary flag character
                         primary_flag = ' '
@@ -968,12 +1400,11 @@ class GentooPackageManagerGUI(QMainWindow):
 
                         display_text = f"{pkg_cat_name} ({version_display}) [{flag_text}]"
 
-                        updates_atoms.add(pkg_cat_name)
                         # Store the display text, potentially overwriting if atom seen again (rare)
                         updates_display_dict[pkg_cat_name] = display_text
 
-            # Sort display text based on the sorted atoms
-            sorted_atoms = sorted(list(updates_atoms))
+            # Sort display text based on the sorted atoms (one sort over the dict's keys)
+            sorted_atoms = sorted(updates_display_dict)
             sorted_display = [updates_display_dict[atom] for atom in sorted_atoms]
 
             return {"atoms": sorted_atoms, "display": sorted_display}
@@ -983,18 +1414,17 @@ class GentooPackageManagerGUI(QMainWindow):
             """Callback when update check finishes."""
             self.update_list_atoms = update_data["atoms"]
             self.update_list_display = update_data["display"]
-            self.update_package_list.clear()
             count = len(self.update_list_atoms)
             if count == 0:
-                self.update_package_list.addItem("No updates available.")
-                self.status_bar.showMessage("System is up to date.", 3000)
+                self.update_model.set_items(["No updates available."])
+                self.show_status("System is up to date.", 3000)
             else:
-                self.update_package_list.addItems(self.update_list_display)
-                self.status_bar.showMessage(f"{count} updates available.", 3000)
+                self.update_model.set_items(self.update_list_display)
+                self.show_status(f"{count} updates available.", 3000)
             self.update_tab_text(self.update_tab_index, "updates", count)
 
 
-        def on_updates_error(error_msg, cb_arg):
+        def on_updates_error(error_msg, cb_arg, returncode=None):
             """Custom error handler for emerge pretend, handles 'no updates' case."""
             # Check if it's the expected output for no updates (emerge often exits non-zero here)
             # Look for specific phrases in stderr or stdout
@@ -1004,38 +1434,39 @@ class GentooPackageManagerGUI(QMainWindow):
                 "emerge: there are no ebuilds to satisfy", # Can happen if @world is empty/broken
                 "Exiting." # Often follows the above messages
             ]
-            is_no_updates = any(phrase in error_msg for phrase in no_updates_phrases)
+            # Only a command that ran and exited non-zero can mean "nothing to update"; a cancel,
+            # timeout or missing command (returncode None) skips the phrase scans entirely
+            ran_and_failed = returncode is not None
+            is_no_updates = ran_and_failed and any(phrase in error_msg for phrase in no_updates_phrases)
 
             if is_no_updates:
                 print("Detected 'no updates' condition from emerge output.")
                 # Treat as success with zero updates
                 on_updates_result({"atoms": [], "display": []})
-                # Manually call the *finish* handler for the sequence because it wasn't a real error
+                # Manually call the *finish* handler because it wasn't a real error
                 self._generic_finished(cb_arg)
             # Handle permission error specifically (emerge pretend doesn't need root, but might access restricted dirs)
-            elif "Permission denied" in error_msg or "are you root?" in error_msg:
-                 self.update_package_list.clear()
-                 self.update_package_list.addItem(f"Permission error checking updates.")
+            elif ran_and_failed and ("Permission denied" in error_msg or "are you root?" in error_msg):
+                 self.update_model.set_items(["Permission error checking updates."])
                  self.update_tab_text(self.update_tab_index, "updates", 0) # Set count to 0 on error
-                 # Call generic error handler to log, show status, and continue sequence
+                 # Call generic error handler to log and show status
                  self._generic_error(error_msg, cb_arg)
             else:
                 # Actual error, let generic handler deal with it
-                self.update_package_list.clear()
-                self.update_package_list.addItem(f"Error checking for updates.")
+                self.update_model.set_items(["Error checking for updates."])
                 self.update_tab_text(self.update_tab_index, "updates", 0) # Set count to 0
                 self._generic_error(error_msg, cb_arg)
 
 
         # Use the generic task runner (emerge pretend doesn't need pkexec)
         self.run_generic_task(
-            command_list=['emerge', '-upvND', '@world'], # '--color=n' might simplify parsing if needed
+            # Quiet and uncolored: only the merge lines the parser reads, without USE flag / size details
+            command_list=[tool_path('emerge'), '-upNDq', '--color=n', '--nospinner', '@world'],
             parser_func=parse_updates,
             on_result=on_updates_result,
             on_finished_callback=self._generic_finished, # Generic success handler
             on_error_callback=on_updates_error,         # *** Use custom error handler ***
-            status_message="Checking for updates (emerge -upvND @world)...",
-            callback_arg=callback_arg # Pass next step
+            status_message="Checking for updates (emerge -upNDq @world)...",
         )
 
     # --- Install, Uninstall, Update Actions (Use run_emerge_command) ---
@@ -1057,7 +1488,7 @@ class GentooPackageManagerGUI(QMainWindow):
         if msg_box.exec() == QMessageBox.StandardButton.Yes:
             # emerge --ask=n requires pkexec later anyway, so might as well use it here.
             # Use --verbose for better output, --ask=n to skip interactive prompts (handled by pkexec)
-            command = ['emerge', '--ask=n', '--verbose'] + package_atoms_to_install
+            command = [tool_path('emerge'), '--ask=n', '--verbose'] + package_atoms_to_install
             self.run_emerge_command( # Use action runner
                 command,
                 on_finished_callback=self._action_requires_refresh, # Refresh lists on success
@@ -1093,7 +1524,7 @@ class GentooPackageManagerGUI(QMainWindow):
 
         if msg_box.exec() == QMessageBox.StandardButton.Yes:
             # Use --ask=n and --verbose
-            command = ['emerge', '--ask=n', '--verbose', '--unmerge'] + selected_atoms
+            command = [tool_path('emerge'), '--ask=n', '--verbose', '--unmerge'] + selected_atoms
             self.run_emerge_command( # Use action runner
                 command,
                 on_finished_callback=self._action_requires_refresh, # Refresh on success
@@ -1115,7 +1546,8 @@ class GentooPackageManagerGUI(QMainWindow):
         """Initiates update for @world if updates are available."""
         if not self.update_list_atoms:
             # Check if list is empty or just hasn't been loaded yet
-            if self.update_package_list.count() > 0 and "Loading" not in self.update_package_list.item(0).text():
+            first_row = self.update_model.index(0).data()
+            if first_row is not None and "Loading" not in first_row:
                  self.show_error("No updates available to perform.")
             else:
                  self.show_error("Updates list is not populated. Please refresh first.")
@@ -1137,7 +1569,7 @@ class GentooPackageManagerGUI(QMainWindow):
 
         if msg_box.exec() == QMessageBox.StandardButton.Yes:
             # Command includes -uND (Update, New, Deep)
-            command = ['emerge', '--ask=n', '--verbose', '-uND'] + packages_or_world
+            command = [tool_path('emerge'), '--ask=n', '--verbose', '-uND'] + packages_or_world
             self.run_emerge_command( # Use action runner
                 command,
                 on_finished_callback=self._action_requires_refresh, # Refresh on success
@@ -1148,18 +1580,32 @@ class GentooPackageManagerGUI(QMainWindow):
 
     def _action_requires_refresh(self):
         """Generic callback after install/uninstall/update finishes successfully."""
-        self.status_bar.showMessage("Operation finished. Refreshing all lists...", 3000)
-        # Start the full refresh sequence again to get updated data
+        self.show_status("Operation finished. Refreshing all lists...", 3000)
+        # Start the full refresh again to get updated data
         self.refresh_all()
 
 
     # --- Utility Functions ---
 
-    def refresh_disk_space(self):
-        """Updates the disk space label in the status bar."""
+    def refresh_disk_space(self, force=False):
+        """Updates the disk space label in the status bar.
+
+        statvfs is only re-read when forced (an emerge action ended), while a
+        forced refresh skipped when hidden is still pending, or once the last
+        reading is older than DISK_STATS_MAX_AGE.
+        """
+        if not self.isVisible() or self.isMinimized():
+            if force:
+                self._disk_dirty = True # Re-read when the label reappears
+            return # Nobody can see the label; showEvent/changeEvent refresh it when it reappears
+        now = time.monotonic()
+        if not (force or self._disk_dirty or now - self._statvfs_at >= DISK_STATS_MAX_AGE):
+            return # Nothing this app did has touched the disk since the last reading
         try:
             # Get stats for the root filesystem
             stats = os.statvfs('/')
+            self._statvfs_at = now
+            self._disk_dirty = False
             # Calculate sizes in bytes
             total_bytes = stats.f_blocks * stats.f_frsize
             # Available to non-root user
@@ -1169,35 +1615,69 @@ class GentooPackageManagerGUI(QMainWindow):
             # but let's stick to the common interpretation:
             used_bytes = total_bytes - (stats.f_bfree * stats.f_frsize)
 
-            # Convert to GB
-            total_gb, available_gb, used_gb = [b / (1024**3) for b in (total_bytes, available_bytes, used_bytes)]
+            # Convert to tenths of a GB with exact integer arithmetic
+            used_tenths = (used_bytes * 10 + _HALF_TENTH_GB) >> 30
+            total_tenths = (total_bytes * 10 + _HALF_TENTH_GB) >> 30
+            available_tenths = (available_bytes * 10 + _HALF_TENTH_GB) >> 30
 
-            # Format the string
-            disk_info = f"Disk (/): {used_gb:.1f}/{total_gb:.1f} GB ({available_gb:.1f} GB Free)"
-            self.disk_space_label.setText(disk_info)
+            # Only format when a displayed value changed
+            disk_key = (used_tenths, total_tenths, available_tenths)
+            if disk_key == self._disk_info_key:
+                return # Label already shows these values
+            disk_info = DISK_INFO_TEMPLATE.format(used_tenths / 10, total_tenths / 10, available_tenths / 10)
         except Exception as e:
-            self.disk_space_label.setText("Disk: Error")
             print(f"Error getting disk space: {e}")
+            if self._disk_info_key is None:
+                return # Error text already shown
+            disk_key, disk_info = None, "Disk: Error"
+
+        self._disk_info_key = disk_key # Skip the relayout/repaint next time if nothing changed
+        self.disk_space_label.setText(disk_info)
 
 
     def show_error(self, message):
         """Displays a critical error message box."""
         QMessageBox.critical(self, "Error", message)
 
+    def _finish_close(self):
+        """Closes the window for real once a cancel-and-exit has wound down (or timed out)."""
+        if self._close_now:
+            return
+        self._close_now = True
+        self.close()
+
+    def showEvent(self, event):
+        """Refreshes disk space as the window appears and resumes the periodic refresh."""
+        super().showEvent(event)
+        self.refresh_disk_space()
+        self.disk_space_timer.start(REFRESH_INTERVAL)
+
+    def hideEvent(self, event):
+        """Stops the periodic disk space refresh while the window is hidden."""
+        super().hideEvent(event)
+        self.disk_space_timer.stop()
+
+    def changeEvent(self, event):
+        """Catches un-minimizing, which doesn't send a showEvent, to refresh the stale label."""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange and not self.isMinimized():
+            self.refresh_disk_space()
+
     def closeEvent(self, event):
         """Handle closing the window, especially if an operation is running."""
-        if self.current_worker and self.current_worker.isRunning():
+        if self._active_workers and not self._close_now:
             reply = QMessageBox.question(self, 'Confirm Exit',
                                          "An operation is currently in progress.\nExiting now may leave the system in an inconsistent state.\n\nExit anyway?",
                                          QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                                          QMessageBox.StandardButton.No) # Default to No
             if reply == QMessageBox.StandardButton.Yes:
-                self.status_bar.showMessage("Exiting: Attempting to cancel operation...")
+                self.show_status("Exiting: Attempting to cancel operation...")
+                self._close_when_idle = True
                 self.cancel_operation()
-                # Give the worker a very brief moment to terminate if possible
-                if self.current_worker:
-                    self.current_worker.wait(500) # Wait 0.5 sec
-                event.accept() # Close the window
+                # Give the workers a very brief moment to terminate, without blocking the event loop:
+                # the window closes when the last one reports back, or after 0.5 sec at the latest
+                QTimer.singleShot(500, self._finish_close)
+                event.ignore()
             else:
                 event.ignore() # Don't close
         else:
@@ -1206,46 +1686,41 @@ class GentooPackageManagerGUI(QMainWindow):
 
 # --- Main Execution ---
 if __name__ == "__main__":
-    # Check if running as root (generally discouraged for GUI apps)
-    try:
-        if hasattr(os, 'geteuid') and os.geteuid() == 0: # Check if geteuid exists (Unix-like)
-            print("-" * 68)
-            print(" WARNING: Running this GUI directly as root is not recommended! ")
-            print(" Please run as a regular user. Privileged operations will use ")
-            print(" 'pkexec' (PolicyKit) to ask for authentication when needed.  ")
-            print("-" * 68)
-            # Optionally, prevent startup or just warn
-            # reply = QMessageBox.warning(None, "Run as Root Warning",
-            #                             "Running this GUI directly as root is not recommended.\n"
-            #                             "Privileged operations use 'pkexec'.\n\nContinue anyway?",
-            #                             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            #                             QMessageBox.StandardButton.No)
-            # if reply == QMessageBox.StandardButton.No:
-            #     sys.exit(1)
-
-    except AttributeError: pass # os.geteuid doesn't exist on Windows
-
-    app = QApplication(sys.argv)
-    app.setStyle("Fusion") # Fusion style often looks better across platforms
-
-    # Check essential commands needed for data loading
-    missing_cmds = []
-    for cmd in ['equery', 'eix', 'emerge']:
-        if subprocess.run(['which', cmd], capture_output=True).returncode != 0:
-            missing_cmds.append(cmd)
+    # Check essential commands needed for data loading, before any Qt setup
+    missing_cmds = [cmd for cmd in ('equery', 'eix', 'emerge') if TOOLS[cmd] is None]
 
     if missing_cmds:
-        QMessageBox.critical(None, "Missing Dependencies",
-                             f"The following essential command(s) could not be found in PATH:\n\n"
-                             f"- {', '.join(missing_cmds)}\n\n"
-                             f"Please install them (e.g., app-portage/gentoolkit for equery, app-portage/eix for eix) and ensure they are in your system's PATH.\nThe application will now exit.")
+        missing_msg = (f"The following essential command(s) could not be found in PATH:\n\n"
+                       f"- {', '.join(missing_cmds)}\n\n"
+                       f"Please install them (e.g., app-portage/gentoolkit for equery, app-portage/eix for eix) and ensure they are in your system's PATH.\nThe application will now exit.")
+        print(missing_msg, file=sys.stderr)
+        if not sys.stderr.isatty():
+            # Started from a desktop launcher, where nobody sees stderr: show the dialog too
+            app = QApplication(sys.argv)
+            QMessageBox.critical(None, "Missing Dependencies", missing_msg)
         sys.exit(1)
 
-    # Check for pkexec (needed for actions)
-    if subprocess.run(['which', 'pkexec'], capture_output=True).returncode != 0:
-         QMessageBox.warning(None, "Missing pkexec",
-                              "The 'pkexec' command was not found.\nYou will likely be unable to perform actions like install, update, sync, or uninstall.\n\nPlease ensure PolicyKit is installed and configured.")
-         # Allow running, but warn
+    # Check if running as root (generally discouraged for GUI apps)
+    is_root = getattr(os, 'geteuid', lambda: -1)() == 0 # os.geteuid doesn't exist on Windows
+    if is_root:
+        print("-" * 68)
+        print(" WARNING: Running this GUI directly as root is not recommended! ")
+        print(" Please run as a regular user. Privileged operations will use ")
+        print(" 'pkexec' (PolicyKit) to ask for authentication when needed.  ")
+        print("-" * 68)
+        # Optionally, prevent startup or just warn
+        # reply = QMessageBox.warning(None, "Run as Root Warning",
+        #                             "Running this GUI directly as root is not recommended.\n"
+        #                             "Privileged operations use 'pkexec'.\n\nContinue anyway?",
+        #                             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        #                             QMessageBox.StandardButton.No)
+        # if reply == QMessageBox.StandardButton.No:
+        #     sys.exit(1)
+
+    # Fusion style often looks better across platforms; picked at construction (user's QT_STYLE_OVERRIDE wins)
+    os.environ.setdefault("QT_STYLE_OVERRIDE", "Fusion")
+    app = QApplication(sys.argv)
+    # pkexec is only needed for actions; run_emerge_command warns about it on first use
 
     main_window = GentooPackageManagerGUI()
     main_window.show()